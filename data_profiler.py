@@ -0,0 +1,185 @@
+import copy
+import html
+import json
+
+import numpy as np
+import pandas as pd
+
+from streaming_stats import HyperLogLog, QuantileSketch, RunningMoments
+
+
+class DataProfiler:
+    """Null counts, moments, min/max, distinct counts and quantiles for every column in one pass
+
+    Feed it DataFrame chunks with update() (or use profile_csv) and read the result with report(),
+    to_json() or to_html(). Each chunk is touched once: a single isna() for nulls, one
+    RunningMoments update for all numeric columns, plus a QuantileSketch and a HyperLogLog per column.
+    Profilers built on separate files or workers can be combined with merge().
+    """
+
+    def __init__(self, quantiles=(0.25, 0.5, 0.75), hll_precision=14, sketch_k=2048, deep_memory=True):
+        self.quantiles = tuple(quantiles)
+        self.hll_precision = hll_precision
+        self.sketch_k = sketch_k
+        self.deep_memory = deep_memory
+        self.columns = None
+        self.rows = 0
+        self.chunks = 0
+
+    def _start(self, chunk):
+        self.columns = list(chunk.columns)
+        self.numeric_cols = [col for col in self.columns if pd.api.types.is_numeric_dtype(chunk[col])
+                             and not pd.api.types.is_bool_dtype(chunk[col])]
+        self.dtypes = {col: str(chunk[col].dtype) for col in self.columns}
+        self.nulls = np.zeros(len(self.columns), dtype=np.int64)
+        self.memory_bytes = np.zeros(len(self.columns), dtype=np.int64)
+        self.moments = RunningMoments(len(self.numeric_cols))
+        self.sketches = {col: QuantileSketch(self.sketch_k) for col in self.numeric_cols}
+        self.distinct = {col: HyperLogLog(self.hll_precision) for col in self.columns}
+        # Numeric in the first chunk but not in a later one (e.g. all-NaN, then strings)
+        self.downgraded = set()
+
+    def update(self, chunk):
+        if self.columns is None:
+            self._start(chunk)
+        elif list(chunk.columns) != self.columns:
+            raise ValueError(f"Chunk columns {list(chunk.columns)} do not match {self.columns}")
+        self.rows += len(chunk)
+        self.chunks += 1
+        self.nulls += chunk.isna().to_numpy().sum(axis=0)
+        if self.deep_memory:
+            self.memory_bytes += chunk.memory_usage(index=False, deep=True).to_numpy()
+
+        for col in self.numeric_cols:
+            if col not in self.downgraded and not (pd.api.types.is_numeric_dtype(chunk[col])
+                                                   and not pd.api.types.is_bool_dtype(chunk[col])):
+                self._downgrade(col)
+        if self.numeric_cols:
+            values = np.column_stack([np.full(len(chunk), np.nan) if col in self.downgraded
+                                      else chunk[col].to_numpy(dtype=float) for col in self.numeric_cols])
+            self.moments.update(values)
+            for j, col in enumerate(self.numeric_cols):
+                if col not in self.downgraded:
+                    self.sketches[col].update(values[:, j])
+                    self.distinct[col].update(values[:, j])
+        for col in self.columns:
+            if col not in self.sketches or col in self.downgraded:
+                self.distinct[col].update(chunk[col].to_numpy(dtype=object))
+        return self
+
+    def _downgrade(self, col):
+        # Keep profiling the column, but only for nulls and distinct values
+        self.downgraded.add(col)
+        self.dtypes[col] = 'object'
+
+    def _is_numeric(self, col):
+        return col in self.sketches and col not in self.downgraded
+
+    def merge(self, other):
+        """Fold another profiler in, matching columns by name
+
+        A column stays numeric only if it is numeric on both sides; otherwise it is downgraded to
+        nulls and distinct values, as update() does when a column's dtype drifts between chunks.
+        """
+        if other.columns is None:
+            return self
+        if self.columns is None:
+            self.__dict__.update(copy.deepcopy(other.__dict__))
+            return self
+        if set(other.columns) != set(self.columns):
+            missing = [col for col in self.columns if col not in other.columns]
+            extra = [col for col in other.columns if col not in self.columns]
+            raise ValueError(f"Cannot merge profilers with different columns: "
+                             f"missing {missing}, unexpected {extra}")
+
+        positions = [other.columns.index(col) for col in self.columns]
+        self.rows += other.rows
+        self.chunks += other.chunks
+        self.nulls += other.nulls[positions]
+        self.memory_bytes += other.memory_bytes[positions]
+
+        # Other's moments re-indexed onto self.numeric_cols; columns numeric on one side only are downgraded
+        aligned = RunningMoments(len(self.numeric_cols))
+        for j, col in enumerate(self.numeric_cols):
+            if not other._is_numeric(col):
+                if col not in self.downgraded:
+                    self._downgrade(col)
+                continue
+            k = other.numeric_cols.index(col)
+            for field in ('count', 'mean', 'm2', 'min', 'max'):
+                getattr(aligned, field)[j] = getattr(other.moments, field)[k]
+            if self._is_numeric(col):
+                self.sketches[col].merge(other.sketches[col])
+        self.moments.merge(aligned)
+        for col in self.columns:
+            self.distinct[col].merge(other.distinct[col])
+        return self
+
+    def report(self):
+        columns = {}
+        for i, col in enumerate(self.columns or []):
+            entry = {
+                'dtype': self.dtypes[col],
+                'nulls': int(self.nulls[i]),
+                'null_pct': float(self.nulls[i] / self.rows * 100) if self.rows else 0.0,
+                'distinct_approx': self.distinct[col].count(),
+            }
+            if self.deep_memory:
+                entry['memory_bytes'] = int(self.memory_bytes[i])
+            if col in self.sketches and col not in self.downgraded:
+                j = self.numeric_cols.index(col)
+                count = self.moments.count[j]
+                # Sample standard deviation (ddof=1), as describe() reports it
+                std = float(np.sqrt(self.moments.m2[j] / (count - 1))) if count > 1 else None
+                entry.update({
+                    'mean': float(self.moments.mean[j]) if count else None,
+                    'std': std,
+                    'min': float(self.moments.min[j]) if count else None,
+                    'max': float(self.moments.max[j]) if count else None,
+                    'quantiles': {f'{q:g}': float(v) if count else None for q, v in
+                                  zip(self.quantiles, self.sketches[col].quantile(self.quantiles))},
+                })
+            columns[col] = entry
+        return {'rows': self.rows, 'chunks': self.chunks, 'columns': columns}
+
+    def to_json(self, path=None, indent=2):
+        text = json.dumps(self.report(), indent=indent)
+        if path:
+            with open(path, 'w') as f:
+                f.write(text)
+        return text
+
+    def to_html(self, title='Data profile'):
+        report = self.report()
+        headers = ['column', 'dtype', 'nulls', 'null %', 'distinct (approx)', 'mean', 'std', 'min',
+                   *[f'q{q:g}' for q in self.quantiles], 'max']
+        rows = []
+        for col, entry in report['columns'].items():
+            quantiles = entry.get('quantiles', {})
+            cells = [col, entry['dtype'], entry['nulls'], f"{entry['null_pct']:.1f}", entry['distinct_approx'],
+                     entry.get('mean'), entry.get('std'), entry.get('min'),
+                     *[quantiles.get(f'{q:g}') for q in self.quantiles], entry.get('max')]
+            cells = ['' if cell is None else f'{cell:.4g}' if isinstance(cell, float) else cell for cell in cells]
+            rows.append('<tr>' + ''.join(f'<td>{html.escape(str(cell))}</td>' for cell in cells) + '</tr>')
+        return (f'<h3>{html.escape(title)}</h3>'
+                f'<p>{report["rows"]:,} rows in {report["chunks"]} chunk(s)</p>'
+                '<table class="profile-table"><thead><tr>'
+                + ''.join(f'<th>{html.escape(h)}</th>' for h in headers)
+                + '</tr></thead><tbody>' + ''.join(rows) + '</tbody></table>')
+
+
+def profile_frame(df, chunksize=None, **kwargs):
+    profiler = DataProfiler(**kwargs)
+    if chunksize is None:
+        return profiler.update(df)
+    for start in range(0, len(df), chunksize):
+        profiler.update(df.iloc[start:start + chunksize])
+    return profiler
+
+
+def profile_csv(path, chunksize=250_000, **kwargs):
+    """Profile a CSV with a single chunked read"""
+    profiler = DataProfiler(**kwargs)
+    for chunk in pd.read_csv(path, chunksize=chunksize):
+        profiler.update(chunk)
+    return profiler
@@ -1,31 +1,93 @@
+import base64
 import logging
+import mimetypes
+import os
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
 import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
 
 # Configure logging
-logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - '%(message)s')
+logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
+
+# Used when the token endpoint does not return expires_in
+DEFAULT_TOKEN_TTL = 300
 
 class EmailUtility:
-    def __init__(self, oauth2_url, client_id, client_secret, scope):
+    def __init__(self, oauth2_url, client_id, client_secret, scope, token_refresh_margin=60,
+                 api_url='https://dummyapi.example.com/emailnotification', pool_size=10, max_retries=3,
+                 backoff_factor=0.5):
         self.oauth2_url = oauth2_url
         self.client_id = client_id
         self.client_secret = client_secret
         self.scope = scope
+        self.api_url = api_url
+        self.session = self._create_session(pool_size, max_retries, backoff_factor)
+
+        # Cached access token, refreshed token_refresh_margin seconds before it expires
+        self.token_refresh_margin = token_refresh_margin
+        self._token = None
+        self._token_refresh_at = 0.0
+        self._token_lock = threading.Lock()
+
+    def get_oauth2_token(self, rejected_token=None):
+        # The lock is held during the refresh so concurrent callers wait for one request instead of starting their own
+        with self._token_lock:
+            token_is_fresh = self._token is not None and time.monotonic() < self._token_refresh_at
+            if token_is_fresh and self._token != rejected_token:
+                return self._token
+
+            token, expires_in = self._request_oauth2_token()
+            self._token = token
+            self._token_refresh_at = time.monotonic() + expires_in - min(self.token_refresh_margin, expires_in / 2)
+            return token
+
+    def invalidate_token(self):
+        with self._token_lock:
+            self._token = None
+            self._token_refresh_at = 0.0
+
+    def _create_session(self, pool_size, max_retries, backoff_factor):
+        # Keep-alive connection pool shared by the token and email calls.
+        # Retried: failed connections (nothing was sent) and 429/503 responses (the server refused the message).
+        # Read timeouts and dropped connections are not retried, since the server may already have accepted
+        # the POST and a retry would send the email twice.
+        retry = Retry(
+            total=max_retries,
+            read=0,
+            other=0,
+            backoff_factor=backoff_factor,
+            status_forcelist=(429, 503),
+            allowed_methods=frozenset(['POST']),
+            raise_on_status=False,
+        )
+        adapter = HTTPAdapter(pool_connections=2, pool_maxsize=pool_size, max_retries=retry)
+        session = requests.Session()
+        session.mount('https://', adapter)
+        session.mount('http://', adapter)
+        return session
 
-    def get_oauth2_token(self):
+    def close(self):
+        self.session.close()
+
+    def _request_oauth2_token(self):
         payload = {
             'grant_type': 'client_credentials',
             'client_id': self.client_id,
             'client_secret': self.client_secret,
             'scope': self.scope,
         }
-        response = requests.post(self.oauth2_url, data=payload)
+        response = self.session.post(self.oauth2_url, data=payload)
         response.raise_for_status()
-        logging.info('OAuth2 token obtained successfully')
-        return response.json()['access_token']
+        token_data = response.json()
+        expires_in = float(token_data.get('expires_in') or DEFAULT_TOKEN_TTL)
+        logging.info(f'OAuth2 token obtained successfully (expires in {expires_in:.0f}s)')
+        return token_data['access_token'], expires_in
 
-    def send_email_via_api(self, subject, to_email, cc_email, email_content):
+    def send_email_via_api(self, subject, to_email, cc_email, email_content, attachments=None):
         token = self.get_oauth2_token()
-        api_url = 'https://dummyapi.example.com/emailnotification'
         headers = {
             'Authorization': f'Bearer {token}',
             'Content-Type': 'application/json',
@@ -37,7 +99,15 @@ class EmailUtility:
             "to": to_email,
             "cc": cc_email
         }
-        response = requests.post(api_url, headers=headers, json=data)
+        if attachments:
+            data["attachments"] = [self._encode_attachment(path) for path in attachments]
+        response = self.session.post(self.api_url, headers=headers, json=data)
+
+        # A cached token can be revoked before its expiry; fetch a fresh one and retry once
+        if response.status_code == 401:
+            logging.info('Email API rejected the cached OAuth2 token, refreshing')
+            headers['Authorization'] = f'Bearer {self.get_oauth2_token(rejected_token=token)}'
+            response = self.session.post(self.api_url, headers=headers, json=data)
 
         # Log status code and headers
         status_code = response.status_code
@@ -49,3 +119,94 @@ class EmailUtility:
             logging.error(f'Failed to send email via API: {response.text}')
             response.raise_for_status()
         logging.info('Email sent successfully via API')
+        return response
+
+    def _encode_attachment(self, path):
+        file_name = os.path.basename(path)
+        if file_name.endswith('.csv.gz'):
+            content_type = 'application/gzip'
+        elif file_name.endswith('.parquet'):
+            content_type = 'application/vnd.apache.parquet'
+        else:
+            content_type = mimetypes.guess_type(file_name)[0] or 'application/octet-stream'
+        with open(path, 'rb') as attachment_file:
+            content = base64.b64encode(attachment_file.read()).decode('ascii')
+        logging.info(f'Attaching {file_name} ({os.path.getsize(path)} bytes)')
+        return {"fileName": file_name, "contentType": content_type, "contentBytes": content}
+
+    def send_many(self, messages, max_workers=4):
+        # messages: list of dicts with the send_email_via_api keyword arguments.
+        # Returns one status entry per message, in input order; a failed send does not stop the others.
+        def send_one(index, message):
+            status = {'index': index, 'subject': message.get('subject'), 'to': message.get('to_email')}
+            try:
+                response = self.send_email_via_api(**message)
+                status.update(sent=True, status_code=response.status_code, error=None)
+            except Exception as e:
+                logging.error(f'Failed to send email {index} ({status["subject"]}): {e}')
+                response = getattr(e, 'response', None)
+                status.update(sent=False, status_code=getattr(response, 'status_code', None), error=str(e))
+            return status
+
+        logging.info(f'Sending {len(messages)} emails with up to {max_workers} workers')
+        with ThreadPoolExecutor(max_workers=max(1, max_workers)) as executor:
+            futures = [executor.submit(send_one, index, message) for index, message in enumerate(messages)]
+            report = [future.result() for future in futures]
+
+        sent_count = sum(status['sent'] for status in report)
+        logging.info(f'Sent {sent_count} of {len(report)} emails')
+        return report
+
+if __name__ == '__main__':
+    # Throughput check against a local stub of the token and email endpoints
+    import json
+    from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+    token_calls = 0
+    token_calls_lock = threading.Lock()
+
+    class StubHandler(BaseHTTPRequestHandler):
+        protocol_version = 'HTTP/1.1'
+
+        def do_POST(self):
+            global token_calls
+            body = self.rfile.read(int(self.headers.get('Content-Length', 0)))
+            if self.path == '/token':
+                with token_calls_lock:
+                    token_calls += 1
+                self._reply(200, {'access_token': 'stub-token', 'expires_in': 3600})
+            elif json.loads(body).get('subject', '').startswith('bad'):
+                self._reply(400, {'error': 'rejected by stub'})
+            else:
+                self._reply(202, {'status': 'queued'})
+
+        def _reply(self, status, payload):
+            content = json.dumps(payload).encode('utf-8')
+            self.send_response(status)
+            self.send_header('Content-Type', 'application/json')
+            self.send_header('Content-Length', str(len(content)))
+            self.end_headers()
+            self.wfile.write(content)
+
+        def log_message(self, format, *args):
+            pass
+
+    logging.getLogger().setLevel(logging.WARNING)
+    server = ThreadingHTTPServer(('127.0.0.1', 0), StubHandler)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    base_url = f'http://127.0.0.1:{server.server_address[1]}'
+
+    messages = [{'subject': f'report {i}', 'to_email': ['ops@example.com'], 'cc_email': [],
+                 'email_content': '<p>stub</p>'} for i in range(200)]
+    messages[17]['subject'] = 'bad report 17'
+    email_util = EmailUtility(f'{base_url}/token', 'client', 'secret', 'scope', api_url=f'{base_url}/email')
+    start = time.perf_counter()
+    report = email_util.send_many(messages, max_workers=8)
+    seconds = time.perf_counter() - start
+    email_util.close()
+    server.shutdown()
+
+    failed = [status for status in report if not status['sent']]
+    print(f'{len(report)} messages in {seconds:.2f}s ({len(report) / seconds:.0f} msg/s), '
+          f'{token_calls} token request(s)')
+    print(f'Failed: {[(status["index"], status["status_code"]) for status in failed]}')
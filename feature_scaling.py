@@ -3,6 +3,7 @@ import numpy as np
 from sklearn.preprocessing import StandardScaler, MinMaxScaler, RobustScaler, MaxAbsScaler, Normalizer
 from sklearn.preprocessing import QuantileTransformer, PowerTransformer
 import matplotlib.pyplot as plt
+from streaming_stats import QuantileSketch, RunningMoments
 
 # Create dataset with different scales
 np.random.seed(42)
@@ -285,6 +286,492 @@ print("-" * 36)
 for i, col in enumerate(df.columns):
     print(f"{col:<12} {feature_contrib_orig[i]:<12.2f} {feature_contrib_std[i]:<12.2f}")
 
+# FIT ONCE, TRANSFORM MANY: SCALER REGISTRY
+print("\n12. SCALER REGISTRY: FIT ONCE, TRANSFORM MANY")
+print("-" * 40)
+
+import json
+import os
+import tempfile
+from scipy.special import ndtri
+
+QUANTILE_BOUNDS = 1e-7  # same clipping sklearn's QuantileTransformer applies before the normal ppf
+
+def _yeo_johnson(x, lambdas):
+    out = np.empty_like(x)
+    pos = x >= 0
+    lam = np.broadcast_to(lambdas, x.shape)
+    with np.errstate(divide='ignore', invalid='ignore'):
+        pos_log = np.abs(lam) < 1e-8
+        neg_log = np.abs(lam - 2) < 1e-8
+        out[pos] = np.where(pos_log[pos], np.log1p(x[pos]), (np.power(x[pos] + 1, lam[pos]) - 1) / lam[pos])
+        neg = ~pos
+        out[neg] = np.where(neg_log[neg], -np.log1p(-x[neg]),
+                            -(np.power(-x[neg] + 1, 2 - lam[neg]) - 1) / (2 - lam[neg]))
+    return out
+
+def _box_cox(x, lambdas):
+    with np.errstate(divide='ignore', invalid='ignore'):
+        return np.where(np.abs(lambdas) < 1e-8, np.log(x), (np.power(x, lambdas) - 1) / lambdas)
+
+class ScalerRegistry:
+    """Fit each scaler once per column group, persist its parameters, and transform with plain NumPy"""
+
+    def __init__(self):
+        self.entries = {}  # name -> {'kind', 'columns', 'options', 'params'}
+
+    def fit(self, name, kind, data, columns, **options):
+        """kind: standard, minmax, robust, maxabs, quantile or power"""
+        X = data[columns].to_numpy(dtype=float)
+        if kind == 'standard':
+            scaler = StandardScaler().fit(X)
+            params = {'offset': scaler.mean_, 'scale': scaler.scale_}
+        elif kind == 'minmax':
+            scaler = MinMaxScaler().fit(X)
+            params = {'offset': -scaler.min_ / scaler.scale_, 'scale': 1 / scaler.scale_}
+        elif kind == 'robust':
+            scaler = RobustScaler().fit(X)
+            params = {'offset': scaler.center_, 'scale': scaler.scale_}
+        elif kind == 'maxabs':
+            scaler = MaxAbsScaler().fit(X)
+            params = {'offset': np.zeros(X.shape[1]), 'scale': scaler.scale_}
+        elif kind == 'quantile':
+            options.setdefault('output_distribution', 'uniform')
+            scaler = QuantileTransformer(n_quantiles=min(1000, len(X)), random_state=42, **options).fit(X)
+            params = {'quantiles': scaler.quantiles_, 'references': scaler.references_}
+        elif kind == 'power':
+            options.setdefault('method', 'yeo-johnson')
+            # Precomputed lambdas (e.g. from estimate_power_lambdas) skip the optimization
+            lambdas = options.pop('lambdas', None)
+            if lambdas is None:
+                lambdas = PowerTransformer(method=options['method'], standardize=False).fit(X).lambdas_
+            params = {'lambdas': np.asarray(lambdas, dtype=float)}
+            transformed = self._power(X, params['lambdas'], options['method'])
+            params['offset'] = transformed.mean(axis=0)
+            params['scale'] = transformed.std(axis=0)
+        else:
+            raise ValueError(f"Unknown scaler kind: {kind}")
+        self.entries[name] = {'kind': kind, 'columns': list(columns), 'options': options, 'params': params}
+        return self
+
+    @staticmethod
+    def _power(X, lambdas, method):
+        return _box_cox(X, lambdas) if method == 'box-cox' else _yeo_johnson(X, lambdas)
+
+    def transform(self, name, data):
+        """Apply a fitted entry to a DataFrame or 2D array; returns a new float64 NumPy array"""
+        columns = self.entries[name]['columns']
+        X = data[columns].to_numpy(dtype=float, copy=True) if hasattr(data, 'columns') else np.array(data, dtype=float)
+        return self.transform_inplace(name, X)
+
+    def transform_inplace(self, name, X):
+        """Scale a 2D NumPy block in place, keeping its dtype (e.g. float32); columns must match the entry"""
+        entry = self.entries[name]
+        params = entry['params']
+        kind = entry['kind']
+
+        if kind in ('quantile', 'power'):
+            # One column at a time keeps the temporaries to a single column
+            for j in range(X.shape[1]):
+                X[:, j] = self.transform_column(name, j, X[:, j])
+            return X
+        scale = np.where(params['scale'] == 0, 1.0, params['scale'])
+        X -= params['offset'].astype(X.dtype)
+        X /= scale.astype(X.dtype)
+        return X
+
+    def transform_column(self, name, j, column):
+        """Transform the values of the entry's j-th column; returns a new 1D array"""
+        entry = self.entries[name]
+        params = entry['params']
+        if entry['kind'] == 'quantile':
+            quantiles, references = params['quantiles'], params['references']
+            # Average of the forward and backward interpolation, as sklearn does for repeated quantiles
+            result = 0.5 * (np.interp(column, quantiles[:, j], references)
+                            - np.interp(-column, -quantiles[::-1, j], -references[::-1]))
+            if entry['options']['output_distribution'] == 'normal':
+                result = ndtri(np.clip(result, QUANTILE_BOUNDS, 1 - QUANTILE_BOUNDS))
+            return result
+        if entry['kind'] == 'power':
+            column = self._power(column, params['lambdas'][j], entry['options']['method'])
+        scale = params['scale'][j] if params['scale'][j] != 0 else 1.0
+        return (column - params['offset'][j]) / scale
+
+    def save(self, path):
+        """Write all parameters to one .npz file; metadata is stored as JSON"""
+        arrays = {}
+        meta = {}
+        for name, entry in self.entries.items():
+            meta[name] = {key: entry[key] for key in ('kind', 'columns', 'options')}
+            for param, value in entry['params'].items():
+                arrays[f'{name}/{param}'] = value
+        np.savez_compressed(path, __meta__=np.array(json.dumps(meta)), **arrays)
+
+    @classmethod
+    def load(cls, path):
+        registry = cls()
+        with np.load(path, allow_pickle=False) as saved:
+            meta = json.loads(str(saved['__meta__']))
+            for name, entry in meta.items():
+                prefix = f'{name}/'
+                entry['params'] = {key[len(prefix):]: saved[key] for key in saved.files if key.startswith(prefix)}
+                registry.entries[name] = entry
+        return registry
+
+normal_cols = ['age', 'salary', 'experience', 'score']
+registry = ScalerRegistry()
+registry.fit('standard', 'standard', df, normal_cols)
+registry.fit('minmax', 'minmax', df, df.columns)
+registry.fit('robust_skewed', 'robust', df, ['distance_km'])
+registry.fit('quantile_normal', 'quantile', df, df.columns, output_distribution='normal')
+registry.fit('yeo_johnson', 'power', df, df.columns, method='yeo-johnson')
+registry.fit('box_cox', 'power', df_positive, df.columns, method='box-cox')
+
+with tempfile.TemporaryDirectory() as tmp_dir:
+    registry_path = os.path.join(tmp_dir, 'scalers.npz')
+    registry.save(registry_path)
+    print(f"Saved {len(registry.entries)} fitted scalers in {os.path.getsize(registry_path):,} bytes")
+    serving_registry = ScalerRegistry.load(registry_path)
+
+# A new batch at inference time: no sklearn objects are constructed
+new_batch = df.sample(10, random_state=1)
+checks = {
+    'standard': scaler_standard.transform(new_batch)[:, [df.columns.get_loc(c) for c in normal_cols]],
+    'minmax': scaler_minmax.transform(new_batch),
+    'quantile_normal': qt_normal.transform(new_batch),
+    'yeo_johnson': pt_yeo.transform(new_batch),
+    'box_cox': pt_box.transform(df_positive.loc[new_batch.index]),
+}
+for name, expected in checks.items():
+    batch = df_positive.loc[new_batch.index] if name == 'box_cox' else new_batch
+    print(f"  {name:<16} matches sklearn: {np.allclose(serving_registry.transform(name, batch), expected)}")
+
+# STREAMING (PARTIAL FIT) SCALING
+print("\n13. STREAMING SCALING OVER CHUNKS")
+print("-" * 40)
+
+from joblib import Parallel, delayed
+from scipy.stats import boxcox_normmax, yeojohnson_normmax
+
+def iter_chunks(path, columns=None, chunksize=100_000):
+    """Yield DataFrame chunks from a CSV or Parquet file"""
+    if path.endswith('.parquet'):
+        import pyarrow.parquet as pq
+        for batch in pq.ParquetFile(path).iter_batches(batch_size=chunksize, columns=columns):
+            yield batch.to_pandas()
+    else:
+        yield from pd.read_csv(path, usecols=columns, chunksize=chunksize)
+
+class StreamingScalerStats:
+    """Running moments, min/max/max-abs and quantile sketches for a column group, built chunk by chunk"""
+
+    def __init__(self, columns, sketch_k=2048):
+        self.columns = list(columns)
+        self.moments = RunningMoments(len(self.columns))
+        self.sketches = [QuantileSketch(k=sketch_k, seed=i) for i in range(len(self.columns))]
+
+    def partial_fit(self, chunk):
+        values = chunk[self.columns].to_numpy(dtype=float)
+        self.moments.update(values)
+        for j, sketch in enumerate(self.sketches):
+            sketch.update(values[:, j])
+        return self
+
+    def merge(self, other):
+        """Combine statistics fitted on another file or worker"""
+        self.moments.merge(other.moments)
+        for sketch, other_sketch in zip(self.sketches, other.sketches):
+            sketch.merge(other_sketch)
+        return self
+
+    def fit_file(self, path, chunksize=100_000):
+        for chunk in iter_chunks(path, self.columns, chunksize):
+            self.partial_fit(chunk)
+        return self
+
+    @classmethod
+    def fit_files(cls, paths, columns, chunksize=100_000, n_jobs=-1):
+        """Fit each file in its own worker process, then merge the partial statistics"""
+        partials = Parallel(n_jobs=n_jobs)(delayed(cls(columns).fit_file)(path, chunksize) for path in paths)
+        stats = partials[0]
+        for partial in partials[1:]:
+            stats.merge(partial)
+        return stats
+
+    def register(self, registry, name, kind, n_quantiles=1000, output_distribution='uniform',
+                 method='yeo-johnson'):
+        """Store the fitted parameters as a ScalerRegistry entry, ready for its NumPy transform
+
+        Power lambdas are fitted on an evenly spaced quantile grid read from each sketch (the exact
+        sorted column while it holds fewer than sketch_k values); the standardizing mean and std are
+        the sketch-weighted moments of the transformed retained values.
+        """
+        moments = self.moments
+        options = {}
+        if kind == 'standard':
+            params = {'offset': moments.mean, 'scale': moments.std}
+        elif kind == 'minmax':
+            params = {'offset': moments.min, 'scale': moments.max - moments.min}
+        elif kind == 'maxabs':
+            params = {'offset': np.zeros(len(self.columns)), 'scale': moments.max_abs}
+        elif kind == 'robust':
+            q1, median, q3 = np.array([sketch.quantile([0.25, 0.5, 0.75]) for sketch in self.sketches]).T
+            params = {'offset': median, 'scale': q3 - q1}
+        elif kind == 'quantile':
+            references = np.linspace(0, 1, n_quantiles)
+            quantiles = np.column_stack([sketch.quantile(references) for sketch in self.sketches])
+            params = {'quantiles': np.maximum.accumulate(quantiles, axis=0), 'references': references}
+            options['output_distribution'] = output_distribution
+        elif kind == 'power':
+            options['method'] = method
+            lambdas, offset, scale = [], [], []
+            for sketch in self.sketches:
+                grid = sketch.quantile(np.linspace(0, 1, int(min(sketch.count, 2 * sketch.k))))
+                lam = boxcox_normmax(grid, method='mle') if method == 'box-cox' else yeojohnson_normmax(grid)
+                values, weights = sketch.weighted_values()
+                transformed = _box_cox(values, lam) if method == 'box-cox' else _yeo_johnson(values, lam)
+                mean = np.average(transformed, weights=weights)
+                lambdas.append(lam)
+                offset.append(mean)
+                scale.append(np.sqrt(np.average((transformed - mean) ** 2, weights=weights)))
+            params = {'lambdas': np.array(lambdas), 'offset': np.array(offset), 'scale': np.array(scale)}
+        else:
+            raise ValueError(f"Streaming fit does not support scaler kind: {kind}")
+        registry.entries[name] = {'kind': kind, 'columns': self.columns, 'options': options, 'params': params}
+        return registry
+
+def transform_file(registry, name, input_path, output_path, chunksize=100_000):
+    """Second pass: scale each chunk with the registry entry and append it to a CSV"""
+    columns = registry.entries[name]['columns']
+    for i, chunk in enumerate(iter_chunks(input_path, chunksize=chunksize)):
+        chunk[columns] = registry.transform(name, chunk)
+        chunk.to_csv(output_path, mode='w' if i == 0 else 'a', header=(i == 0), index=False)
+
+with tempfile.TemporaryDirectory() as tmp_dir:
+    # Two files stand in for a partitioned extract; the second one is Parquet
+    csv_path = os.path.join(tmp_dir, 'part-0.csv')
+    parquet_path = os.path.join(tmp_dir, 'part-1.parquet')
+    df.iloc[:60].to_csv(csv_path, index=False)
+    df.iloc[60:].to_parquet(parquet_path, index=False)
+
+    stream_stats = StreamingScalerStats.fit_files([csv_path, parquet_path], df.columns, chunksize=16, n_jobs=2)
+    stream_registry = ScalerRegistry()
+    for kind in ['standard', 'minmax', 'maxabs', 'robust', 'quantile', 'power']:
+        stream_stats.register(stream_registry, kind, kind)
+
+    scaled_path = os.path.join(tmp_dir, 'part-0-standardized.csv')
+    transform_file(stream_registry, 'standard', csv_path, scaled_path, chunksize=16)
+    df_stream_scaled = pd.read_csv(scaled_path)
+
+print(f"Rows seen across files: {int(stream_stats.moments.count[0])}")
+print("Streaming fit vs in-memory sklearn fit:")
+print(f"  standard matches: {np.allclose(stream_registry.transform('standard', df), scaler_standard.transform(df))}")
+print(f"  minmax matches:   {np.allclose(stream_registry.transform('minmax', df), scaler_minmax.transform(df))}")
+print(f"  maxabs matches:   {np.allclose(stream_registry.transform('maxabs', df), scaler_maxabs.transform(df))}")
+print(f"  robust matches:   {np.allclose(stream_registry.transform('robust', df), scaler_robust.transform(df))}")
+print(f"  quantile max abs diff: "
+      f"{np.abs(stream_registry.transform('quantile', df) - qt_uniform.transform(df)).max():.4f}")
+print(f"  power (yeo-johnson) matches: "
+      f"{np.allclose(stream_registry.transform('power', df), pt_yeo.transform(df), atol=1e-4)}")
+print(f"  second-pass file matches: {np.allclose(df_stream_scaled, df_standardized.iloc[:60])}")
+
+# SINGLE-PASS MULTI-SCALER COMPARISON
+print("\n14. COMPARING SCALERS IN A SINGLE PASS")
+print("-" * 40)
+
+AFFINE_SCALERS = ('standard', 'minmax', 'robust', 'maxabs')
+
+def compare_scalers(data, kinds=AFFINE_SCALERS, materialize=False, chunksize=None):
+    """Scan the data once, then derive every scaler's summary table from the shared statistics
+
+    Affine scalers (x - offset) / scale need no transformed matrix: min, max, mean and std of
+    the output follow directly from the input moments. Quantile and power scalers are monotonic,
+    so their min and max are the transformed input extremes; mean and std come from transforming
+    each column's sketch values with their weights (exact while a sketch is uncompacted).
+    """
+    columns = data.select_dtypes(include=[np.number]).columns
+    stats = StreamingScalerStats(columns)
+    if chunksize is None:
+        stats.partial_fit(data)
+    else:
+        for start in range(0, len(data), chunksize):
+            stats.partial_fit(data.iloc[start:start + chunksize])
+
+    moments = stats.moments
+    registry = ScalerRegistry()
+    summaries = []
+    for kind in kinds:
+        stats.register(registry, kind, kind)
+        if kind in AFFINE_SCALERS:
+            params = registry.entries[kind]['params']
+            scale = np.where(params['scale'] == 0, 1.0, params['scale'])
+            summary = {
+                'Min': (moments.min - params['offset']) / scale,
+                'Max': (moments.max - params['offset']) / scale,
+                'Mean': (moments.mean - params['offset']) / scale,
+                'Std': moments.std / np.abs(scale),
+            }
+        else:
+            summary = {'Min': [], 'Max': [], 'Mean': [], 'Std': []}
+            for j, sketch in enumerate(stats.sketches):
+                values, weights = sketch.weighted_values()
+                transformed = registry.transform_column(kind, j, values)
+                extremes = registry.transform_column(kind, j, np.array([moments.min[j], moments.max[j]]))
+                mean = np.average(transformed, weights=weights)
+                summary['Min'].append(extremes[0])
+                summary['Max'].append(extremes[1])
+                summary['Mean'].append(mean)
+                summary['Std'].append(np.sqrt(np.average((transformed - mean) ** 2, weights=weights)))
+        summaries.append(pd.DataFrame({'Method': kind, 'Column': columns, **summary}))
+
+    summary_table = pd.concat(summaries, ignore_index=True)
+    outputs = {kind: registry.transform(kind, data) for kind in kinds} if materialize else None
+    return summary_table, outputs
+
+scaler_summary, _ = compare_scalers(df_with_outliers, kinds=('standard', 'minmax', 'robust', 'quantile', 'power'))
+print("Salary column, all scalers from one scan (standard/minmax/robust as in section 9):")
+print(scaler_summary[scaler_summary['Column'] == 'salary'].round(2).to_string(index=False))
+for kind, reference in [('quantile', QuantileTransformer(n_quantiles=100, random_state=42)),
+                        ('power', PowerTransformer(method='yeo-johnson'))]:
+    expected = reference.fit_transform(df_with_outliers)
+    rows = scaler_summary[scaler_summary['Method'] == kind]
+    matches = np.allclose(rows[['Min', 'Max', 'Mean', 'Std']].to_numpy(),
+                          np.column_stack([expected.min(axis=0), expected.max(axis=0),
+                                           expected.mean(axis=0), expected.std(axis=0)]), atol=1e-3)
+    print(f"  {kind} summary matches sklearn's full transform: {matches}")
+
+# A wide table: summaries only, no transformed matrices are kept
+df_wide = pd.DataFrame(np.random.lognormal(size=(2000, 120)), columns=[f'f{i}' for i in range(120)])
+wide_kinds = AFFINE_SCALERS + ('quantile', 'power')
+wide_summary, _ = compare_scalers(df_wide, kinds=wide_kinds, chunksize=500)
+print(f"\nWide table: {df_wide.shape[1]} columns x {len(wide_kinds)} scalers -> "
+      f"{len(wide_summary)} summary rows from a single pass")
+
+# MEMORY-LEAN MODE: FLOAT32, IN PLACE
+print("\n15. MEMORY-LEAN SCALING (FLOAT32, IN PLACE)")
+print("-" * 40)
+
+import tracemalloc
+
+def to_block(data, columns=None, dtype=np.float32):
+    """Copy DataFrame columns once into a contiguous NumPy block of the chosen dtype"""
+    columns = data.columns if columns is None else columns
+    return np.ascontiguousarray(data[columns].to_numpy(dtype=dtype))
+
+def peak_memory_mb(func):
+    """Run func and return (result, peak MB allocated while it ran)"""
+    tracemalloc.start()
+    try:
+        result = func()
+        _, peak = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+    return result, peak / 1024 ** 2
+
+df_big = pd.DataFrame(np.random.normal(50, 10, size=(500_000, len(df.columns))), columns=df.columns)
+lean_registry = ScalerRegistry()
+sklearn_scalers = {
+    'standard': StandardScaler(),
+    'minmax': MinMaxScaler(),
+    'robust': RobustScaler(),
+    'power': PowerTransformer(method='yeo-johnson'),
+}
+for kind, scaler in sklearn_scalers.items():
+    lean_registry.fit(kind, kind, df_big.iloc[:50_000], df.columns)
+    scaler.fit(df_big.iloc[:50_000])
+
+print(f"Transforming {len(df_big):,} x {df_big.shape[1]} "
+      f"(float64 input = {df_big.to_numpy().nbytes / 1024 ** 2:.1f} MB)")
+print(f"{'Method':<10} {'sklearn + DataFrame MB':<24} {'float32 in-place MB':<20} {'Max abs diff':<12}")
+for kind, scaler in sklearn_scalers.items():
+    expected, sklearn_peak = peak_memory_mb(
+        lambda: pd.DataFrame(scaler.transform(df_big), columns=df_big.columns))
+    block = to_block(df_big)  # made once, outside the measurement, and reused by the caller
+    _, lean_peak = peak_memory_mb(lambda: lean_registry.transform_inplace(kind, block))
+    print(f"{kind:<10} {sklearn_peak:<24.1f} {lean_peak:<20.1f} {np.abs(block - expected.to_numpy()).max():<12.2e}")
+
+# BATCHED POWER-TRANSFORM LAMBDA ESTIMATION
+print("\n16. BATCHED BOX-COX / YEO-JOHNSON LAMBDAS")
+print("-" * 40)
+
+import hashlib
+import time
+from scipy import stats
+
+def _column_lambdas(values, method):
+    """MLE lambda per column, the same objective PowerTransformer optimizes"""
+    normmax = stats.boxcox_normmax if method == 'box-cox' else stats.yeojohnson_normmax
+    lambdas = []
+    for column in values.T:
+        column = column[~np.isnan(column)]
+        lambdas.append(normmax(column, method='mle') if method == 'box-cox' else normmax(column))
+    return lambdas
+
+def estimate_power_lambdas(data, columns, method='yeo-johnson', sample_rows=None, n_jobs=-1,
+                           cache_path=None, random_state=42):
+    """Estimate lambdas for all columns together: optional subsample, columns split across workers,
+    and a JSON cache keyed by column name, method and a hash of the fitted values"""
+    sample = data[columns]
+    if sample_rows is not None and len(sample) > sample_rows:
+        sample = sample.sample(n=sample_rows, random_state=random_state)
+    values = sample.to_numpy(dtype=float)
+
+    cache = {}
+    if cache_path and os.path.exists(cache_path):
+        with open(cache_path) as cache_file:
+            cache = json.load(cache_file)
+    keys = [f"{method}:{column}:{hashlib.sha1(np.ascontiguousarray(values[:, j]).tobytes()).hexdigest()}"
+            for j, column in enumerate(columns)]
+    missing = [j for j, key in enumerate(keys) if key not in cache]
+
+    if missing:
+        n_workers = min(len(missing), os.cpu_count() or 1) if n_jobs == -1 else max(1, min(n_jobs, len(missing)))
+        groups = [group for group in np.array_split(missing, n_workers) if len(group)]
+        if len(groups) == 1:
+            results = [_column_lambdas(values[:, groups[0]], method)]
+        else:
+            results = Parallel(n_jobs=len(groups))(
+                delayed(_column_lambdas)(values[:, group], method) for group in groups)
+        for group, group_lambdas in zip(groups, results):
+            for j, lam in zip(group, group_lambdas):
+                cache[keys[j]] = float(lam)
+        if cache_path:
+            with open(cache_path, 'w') as cache_file:
+                json.dump(cache, cache_file)
+
+    return np.array([cache[key] for key in keys])
+
+lambdas_yeo = estimate_power_lambdas(df, list(df.columns), method='yeo-johnson', n_jobs=1)
+lambdas_box = estimate_power_lambdas(df_positive, list(df.columns), method='box-cox', n_jobs=1)
+print(f"Yeo-Johnson lambdas match PowerTransformer: {np.allclose(lambdas_yeo, pt_yeo.lambdas_, atol=1e-4)}")
+print(f"Box-Cox lambdas match PowerTransformer:     {np.allclose(lambdas_box, pt_box.lambdas_, atol=1e-4)}")
+
+lambda_registry = ScalerRegistry().fit('yeo_johnson', 'power', df, df.columns, lambdas=lambdas_yeo)
+print(f"Registry transform with estimated lambdas matches: "
+      f"{np.allclose(lambda_registry.transform('yeo_johnson', df), pt_yeo.transform(df), atol=1e-4)}")
+
+# Wide, skewed table: full sklearn fit vs subsampled parallel fit vs cached rerun
+df_skewed = pd.DataFrame(np.random.lognormal(0, 1, size=(50_000, 40)), columns=[f's{i}' for i in range(40)])
+skewed_cols = list(df_skewed.columns)
+
+start = time.perf_counter()
+PowerTransformer(method='yeo-johnson', standardize=False).fit(df_skewed)
+sklearn_seconds = time.perf_counter() - start
+
+with tempfile.TemporaryDirectory() as tmp_dir:
+    lambda_cache = os.path.join(tmp_dir, 'power_lambdas.json')
+    start = time.perf_counter()
+    estimate_power_lambdas(df_skewed, skewed_cols, sample_rows=10_000, cache_path=lambda_cache)
+    first_seconds = time.perf_counter() - start
+    start = time.perf_counter()
+    estimate_power_lambdas(df_skewed, skewed_cols, sample_rows=10_000, cache_path=lambda_cache)
+    cached_seconds = time.perf_counter() - start
+
+print(f"\n{df_skewed.shape[1]} skewed columns x {len(df_skewed):,} rows:")
+print(f"  PowerTransformer.fit (full data):   {sklearn_seconds:.2f}s")
+print(f"  Subsampled, parallel estimate:      {first_seconds:.2f}s")
+print(f"  Rerun from lambda cache:            {cached_seconds:.2f}s")
+
 print("\n=== SCALING BEST PRACTICES ===")
 print("🎯 Always split data before scaling (avoid data leakage)")
 print("📊 Fit scaler on training data only, transform train & test")
@@ -230,4 +230,289 @@ for pair in high_corr_pairs:
 # Remove one feature from each highly correlated pair
 features_to_remove = set()
 for pair in high_corr_pairs:
-    # Remove the second feature
\ No newline at end of file
+    # Remove the second feature
+    features_to_remove.add(pair[1])
+
+print(f"\nFeatures to remove: {sorted(features_to_remove)}")
+X_corr_selected = X.drop(columns=sorted(features_to_remove))
+print(f"Remaining features: {X_corr_selected.columns.tolist()}")
+
+# METHOD 6: VECTORIZED CORRELATION PRUNING (WIDE DATA)
+print("\n7. METHOD 6: VECTORIZED CORRELATION PRUNING")
+print("-" * 40)
+
+import time
+
+def find_correlated_pairs(X, threshold=0.9, block_size=None):
+    """Find feature pairs with |corr| > threshold using an upper-triangle mask on the raw array
+
+    With block_size set, the correlation is computed block by block from standardized float32
+    columns, so the full p x p matrix is never held in memory.
+    """
+    values = X.to_numpy(dtype=np.float32 if block_size else np.float64)
+    columns = np.asarray(X.columns)
+
+    if block_size is None:
+        with np.errstate(divide='ignore', invalid='ignore'):
+            corr = np.corrcoef(values, rowvar=False)  # NaN for constant columns, never above threshold
+        rows, cols = np.nonzero(np.triu(np.abs(corr) > threshold, k=1))
+        return pd.DataFrame({'feature_1': columns[rows], 'feature_2': columns[cols], 'correlation': corr[rows, cols]})
+
+    std = values.std(axis=0)
+    std[std == 0] = np.inf  # constant columns correlate with nothing
+    z = (values - values.mean(axis=0)) / (std * np.sqrt(len(values)))
+    found = []
+    n_features = z.shape[1]
+    for i in range(0, n_features, block_size):
+        for j in range(i, n_features, block_size):
+            block = z[:, i:i + block_size].T @ z[:, j:j + block_size]
+            mask = np.abs(block) > threshold
+            if i == j:
+                mask = np.triu(mask, k=1)
+            rows, cols = np.nonzero(mask)
+            found.append((rows + i, cols + j, block[rows, cols]))
+    rows, cols, corr_values = (np.concatenate(parts) for parts in zip(*found))
+    return pd.DataFrame({'feature_1': columns[rows], 'feature_2': columns[cols], 'correlation': corr_values})
+
+def prune_correlated_features(X, threshold=0.9, y=None, block_size=None):
+    """Greedy cluster pruning: visit features by priority, keep one, drop everything correlated with it
+
+    Priority is |corr with y| when y is given (most predictive kept first), otherwise the
+    feature with the most correlated partners represents its cluster.
+    """
+    pairs = find_correlated_pairs(X, threshold, block_size)
+    position = {feature: i for i, feature in enumerate(X.columns)}
+    neighbours = [[] for _ in X.columns]
+    for feature_1, feature_2 in zip(pairs['feature_1'], pairs['feature_2']):
+        neighbours[position[feature_1]].append(position[feature_2])
+        neighbours[position[feature_2]].append(position[feature_1])
+
+    if y is not None:
+        with np.errstate(divide='ignore', invalid='ignore'):
+            priority = np.nan_to_num(np.abs(X.corrwith(y).to_numpy()))
+    else:
+        priority = np.array([len(n) for n in neighbours], dtype=float)
+    dropped = np.zeros(len(X.columns), dtype=bool)
+    for i in np.argsort(-priority, kind='stable'):
+        if not dropped[i]:
+            dropped[neighbours[i]] = True
+    return X.columns[dropped].tolist(), pairs
+
+vectorized_pairs = find_correlated_pairs(X, threshold=0.8)
+print("Pairs from the vectorized search (same as the loop above):")
+print(vectorized_pairs.round(3).to_string(index=False))
+drop_features, _ = prune_correlated_features(X, threshold=0.8, y=y)
+print(f"Greedy cluster pruning drops: {drop_features}")
+
+# Timing on a wider synthetic table
+rng = np.random.default_rng(42)
+base = rng.normal(size=(1000, 100)).astype(np.float32)
+X_wide = pd.DataFrame(
+    np.hstack([base] + [base + rng.normal(scale=0.1, size=base.shape).astype(np.float32) for _ in range(4)]),
+    columns=[f'f{i}' for i in range(500)],
+)
+
+start = time.perf_counter()
+loop_pairs = find_correlated_features(X_wide.corr(), threshold=0.9)
+loop_seconds = time.perf_counter() - start
+start = time.perf_counter()
+block_drop, block_pairs = prune_correlated_features(X_wide, threshold=0.9, block_size=256)
+block_seconds = time.perf_counter() - start
+
+print(f"\n{X_wide.shape[1]} features: loop found {len(loop_pairs)} pairs in {loop_seconds:.2f}s, "
+      f"blockwise float32 found {len(block_pairs)} in {block_seconds:.2f}s")
+print(f"Features kept after greedy pruning: {X_wide.shape[1] - len(block_drop)}")
+
+# METHOD 7: FAST RFECV (STEP SCHEDULE, PARALLEL FOLDS)
+print("\n8. METHOD 7: FAST RECURSIVE ELIMINATION WITH CROSS-VALIDATION")
+print("-" * 40)
+
+from joblib import Parallel, delayed
+from sklearn.base import clone
+from sklearn.metrics import get_scorer
+from sklearn.model_selection import StratifiedKFold
+from sklearn.preprocessing import StandardScaler
+
+def _fit_fold(estimator, scorer, X_train, y_train, X_test, y_test, subset):
+    """Fit one fold on a feature subset; return its score and per-feature importances"""
+    model = clone(estimator).fit(X_train[:, subset], y_train)
+    importances = getattr(model, 'feature_importances_', None)
+    if importances is None:
+        importances = np.abs(np.atleast_2d(model.coef_)).sum(axis=0)
+    return scorer(model, X_test[:, subset], y_test), importances
+
+def fast_rfecv(estimator, X, y, cv=5, scoring='accuracy', drop_fraction=0.1, min_features=1,
+               scale=True, n_jobs=-1, random_state=42):
+    """RFECV with a geometric step schedule, parallel folds and fold matrices prepared once
+
+    Coarse phase: drop drop_fraction of the remaining features per step. Fine phase: from the
+    coarse step just above the best size (or the best size itself, if that is the full set), drop
+    one feature at a time down to the next coarse step.
+    Features are ranked by importances averaged over the fold fits, so no extra full-data fit is needed.
+    """
+    values = X.to_numpy(dtype=float)
+    target = np.asarray(y)
+    scorer = get_scorer(scoring)
+
+    # Splits and (optionally) standardized fold matrices are built once and reused by every step
+    folds = []
+    for train_idx, test_idx in StratifiedKFold(cv, shuffle=True, random_state=random_state).split(values, target):
+        X_train, X_test = values[train_idx], values[test_idx]
+        if scale:
+            scaler = StandardScaler().fit(X_train)
+            X_train, X_test = scaler.transform(X_train), scaler.transform(X_test)
+        folds.append((X_train, target[train_idx], X_test, target[test_idx]))
+
+    history = []
+    with Parallel(n_jobs=n_jobs) as parallel:
+        def evaluate(subset, phase):
+            results = parallel(delayed(_fit_fold)(estimator, scorer, *fold, subset) for fold in folds)
+            scores = np.array([score for score, _ in results])
+            importances = np.mean([imp for _, imp in results], axis=0)
+            history.append({'n_features': len(subset), 'mean_score': scores.mean(),
+                            'std_score': scores.std(), 'phase': phase, 'features': subset})
+            # Subset ordered from most to least important
+            return subset[np.argsort(-importances, kind='stable')]
+
+        subset = np.arange(values.shape[1])
+        coarse_subsets = []
+        while True:
+            ranked = evaluate(subset, 'coarse')
+            coarse_subsets.append(ranked)
+            if len(subset) <= min_features:
+                break
+            n_drop = max(1, int(np.ceil(len(subset) * drop_fraction)))
+            subset = ranked[:max(min_features, len(subset) - n_drop)]
+
+        # Refine one feature at a time between the coarse neighbours of the best coarse size;
+        # when the full feature set wins there is no larger neighbour, so start from the full set
+        coarse_sizes = [len(ranked) for ranked in coarse_subsets]
+        best = int(np.argmax([h['mean_score'] for h in history]))
+        start = max(best - 1, 0)
+        stop = coarse_sizes[best + 1] if best + 1 < len(coarse_sizes) else min_features
+        if coarse_sizes[start] - stop > 1:
+            subset = coarse_subsets[start][:-1]
+            while len(subset) > stop:
+                if len(subset) not in coarse_sizes:
+                    subset = evaluate(subset, 'fine')
+                subset = subset[:len(subset) - 1]
+
+    results = pd.DataFrame(history).sort_values(['n_features', 'phase']).reset_index(drop=True)
+    # Smallest subset within the best score, matching RFECV's preference on ties
+    best_row = results.loc[results['mean_score'].idxmax()]
+    selected = X.columns[np.sort(best_row['features'])].tolist()
+    return selected, results.drop(columns='features')
+
+fast_selected, fast_results = fast_rfecv(estimator, X, y, cv=5, n_jobs=1)
+print(f"Fast RFECV optimal number of features: {len(fast_selected)}")
+print(f"Selected features: {fast_selected}")
+print(f"Subsets evaluated: {len(fast_results)} (RFECV evaluates {X.shape[1]})")
+
+# Benchmark: the 1000 x 10 set above and a scaled-up synthetic set
+from sklearn.datasets import make_classification
+
+X_big_values, y_big = make_classification(n_samples=3000, n_features=80, n_informative=12,
+                                          n_redundant=8, random_state=42)
+X_big = pd.DataFrame(X_big_values, columns=[f'f{i}' for i in range(80)])
+
+print(f"\n{'Dataset':<12} {'Method':<14} {'Seconds':<9} {'Features':<9} {'CV score':<9}")
+for name, (X_bench, y_bench) in {'1000x10': (X, y), '3000x80': (X_big, y_big)}.items():
+    start = time.perf_counter()
+    reference = RFECV(estimator=estimator, cv=StratifiedKFold(5, shuffle=True, random_state=42),
+                      scoring='accuracy').fit(X_bench, y_bench)
+    rfecv_seconds = time.perf_counter() - start
+    start = time.perf_counter()
+    bench_selected, bench_results = fast_rfecv(estimator, X_bench, y_bench, cv=5)
+    fast_seconds = time.perf_counter() - start
+    print(f"{name:<12} {'RFECV':<14} {rfecv_seconds:<9.2f} {reference.n_features_:<9} "
+          f"{reference.cv_results_['mean_test_score'].max():<9.4f}")
+    print(f"{name:<12} {'fast_rfecv':<14} {fast_seconds:<9.2f} {len(bench_selected):<9} "
+          f"{bench_results['mean_score'].max():<9.4f}")
+
+# UNIFIED PIPELINE: SHARED STATISTICS, ONE RANKING TABLE
+print("\n9. UNIFIED FEATURE SELECTION PIPELINE")
+print("-" * 40)
+
+class FeatureSelectionPipeline:
+    """Compute variances, univariate scores, correlations and model importances once,
+    then derive every selector from them and return one ranking table"""
+
+    def __init__(self, variance_threshold=0.01, k=5, percentile=50, corr_threshold=0.8,
+                 importance_model=None, lasso_alpha=0.01, random_state=42):
+        self.variance_threshold = variance_threshold
+        self.k = k
+        self.percentile = percentile
+        self.corr_threshold = corr_threshold
+        self.importance_model = importance_model or RandomForestClassifier(n_estimators=100, random_state=random_state)
+        self.lasso_alpha = lasso_alpha
+        self.random_state = random_state
+
+    def fit(self, X, y):
+        values = X.to_numpy(dtype=float)
+        self.features_ = X.columns
+
+        # Shared statistics: each is computed exactly once (population variance, as VarianceThreshold uses)
+        self.variances_ = values.var(axis=0)
+        with np.errstate(divide='ignore', invalid='ignore'):
+            self.f_scores_, self.p_values_ = f_classif(values, y)
+            self.corr_ = np.corrcoef(values, rowvar=False)
+        self.importances_ = self.importance_model.fit(values, y).feature_importances_
+        self.lasso_coefs_ = Lasso(alpha=self.lasso_alpha, random_state=self.random_state).fit(values, y).coef_
+
+        # Selectors derived from the shared statistics (same rules as the sklearn selectors above)
+        f_scores = np.nan_to_num(self.f_scores_, nan=-np.inf)
+        order = np.argsort(-f_scores, kind='stable')
+        n_percentile = int(len(order) * self.percentile / 100)
+        self.selected_ = {
+            'variance': self.variances_ > self.variance_threshold,
+            'k_best': np.isin(np.arange(len(order)), order[:self.k]),
+            'percentile': f_scores >= (np.sort(f_scores)[-n_percentile] if n_percentile else np.inf),
+            'random_forest': self.importances_ >= self.importances_.mean(),
+            'lasso': np.abs(self.lasso_coefs_) > 1e-5,
+            'correlation': self._correlation_keep(f_scores),
+        }
+        return self
+
+    def _correlation_keep(self, priority):
+        """Greedy pruning on the shared correlation matrix; the higher-scoring feature of a pair is kept"""
+        high = np.nan_to_num(np.abs(self.corr_)) > self.corr_threshold
+        np.fill_diagonal(high, False)
+        dropped = np.zeros(len(priority), dtype=bool)
+        for i in np.argsort(-priority, kind='stable'):
+            if not dropped[i]:
+                dropped |= high[i]
+        return ~dropped
+
+    def ranking(self):
+        """One row per feature: shared statistics, each selector's decision and a consolidated rank"""
+        table = pd.DataFrame({
+            'Feature': self.features_,
+            'Variance': self.variances_,
+            'F_score': self.f_scores_,
+            'P_value': self.p_values_,
+            'RF_importance': self.importances_,
+            'Lasso_coef': self.lasso_coefs_,
+            'Max_abs_corr': np.abs(np.nan_to_num(self.corr_) - np.eye(len(self.features_))).max(axis=0),
+        })
+        for name, mask in self.selected_.items():
+            table[f'sel_{name}'] = mask
+        table['Votes'] = np.sum(list(self.selected_.values()), axis=0)
+        table = table.sort_values(['Votes', 'RF_importance'], ascending=False).reset_index(drop=True)
+        table.insert(0, 'Rank', np.arange(1, len(table) + 1))
+        return table
+
+start = time.perf_counter()
+selection_pipeline = FeatureSelectionPipeline(k=5, percentile=50, corr_threshold=0.8).fit(X, y)
+ranking_table = selection_pipeline.ranking()
+pipeline_seconds = time.perf_counter() - start
+
+print(ranking_table[['Rank', 'Feature', 'F_score', 'RF_importance', 'Lasso_coef', 'Votes']].round(4).to_string(index=False))
+print(f"\nBuilt in {pipeline_seconds:.2f}s with one random forest fit")
+
+selected_names = {name: X.columns[mask].tolist() for name, mask in selection_pipeline.selected_.items()}
+print("Agreement with the separate selectors above:")
+print(f"  variance:      {selected_names['variance'] == selected_features_var.tolist()}")
+print(f"  k_best:        {selected_names['k_best'] == selected_features_k.tolist()}")
+print(f"  percentile:    {selected_names['percentile'] == selected_features_perc.tolist()}")
+print(f"  random_forest: {selected_names['random_forest'] == selected_features_rf.tolist()}")
+print(f"  lasso:         {selected_names['lasso'] == selected_features_lasso.tolist()}")
@@ -1,69 +1,320 @@
+import asyncio
 import logging
+import os
+import re
+import shutil
+import tempfile
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from html import escape
+from itertools import chain, islice
 from email_utility import EmailUtility
+from query_cache import ArrowQueryResults, CachingQueryResults
 from google.cloud import bigquery
 
 # Configure logging
 logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
 
+# Shared styles for the result tables, emitted once per email instead of on every cell
+TABLE_CSS = """
+    <style>
+        h2.bq-title { color: #007ACC; font-size: 16px; }
+        table.bq-table { border-collapse: collapse; width: auto; margin-bottom: 20px; border: 1px solid #ccc; font-size: 12px; }
+        table.bq-table th { border: 1px solid #ccc; padding: 2px 4px; text-align: left; background-color: #007ACC; color: white; }
+        table.bq-table td { border: 1px solid #ccc; padding: 2px 4px; color: #555; line-height: 1.2; }
+        p.bq-note { color: #555; font-size: 12px; }
+    </style>
+"""
+
+# Streaming defaults: rows fetched per API page and the largest row batch handed to a consumer
+DEFAULT_PAGE_SIZE = 10000
+DEFAULT_MAX_BATCH_BYTES = 32 * 1024 * 1024
+
+# Sections with more than row_threshold rows are sent as a file_format attachment ('csv.gz' or 'parquet')
+# and the body keeps only the first summary_rows rows
+ATTACHMENT_POLICY = {
+    "row_threshold": 1000,
+    "file_format": "csv.gz",
+    "summary_rows": 20,
+}
+
 class BigQueryUtility:
-    def __init__(self):
-        self.client = bigquery.Client()
+    def __init__(self, client=None, query_cache=None):
+        # The default client is created on first use, so rendering-only callers need no credentials
+        self._client = client
+        self._client_lock = threading.Lock()
+        # Optional query_cache.QueryResultCache shared by repeated report runs and retries
+        self.query_cache = query_cache
+
+    @property
+    def client(self):
+        with self._client_lock:
+            if self._client is None:
+                self._client = bigquery.Client()
+            return self._client
+
+    def execute_query(self, sql, use_cache=True, page_size=DEFAULT_PAGE_SIZE):
+        # Results are fetched page_size rows at a time; with a cache they are stored as they stream,
+        # unless they exceed the cache's byte budget
+        if self.query_cache is not None and use_cache:
+            table = self.query_cache.get(sql)
+            if table is not None:
+                logging.info(f'Using cached results for BigQuery SQL: {sql}')
+                return ArrowQueryResults(table)
 
-    def execute_query(self, sql):
-        logging.info(f'Executing BigQuery SQL: {sql}')
+        logging.info(f'Executing BigQuery SQL (page_size={page_size}): {sql}')
         query_job = self.client.query(sql)
-        results = query_job.result()
+        results = query_job.result(page_size=page_size)
         logging.info('Query executed successfully')
+
+        if self.query_cache is not None:
+            return CachingQueryResults(results, self.query_cache, sql, self.query_cache.max_bytes)
         return results
 
-    def format_results_to_html_table(self, results, title):
+    def stream_query(self, sql, page_size=DEFAULT_PAGE_SIZE):
+        # Bypasses the cache: the RowIterator fetches one page of page_size rows at a time
+        return self.execute_query(sql, use_cache=False, page_size=page_size)
+
+    def iter_record_batches(self, results, max_batch_bytes=DEFAULT_MAX_BATCH_BYTES):
+        # Walks the results page by page as pyarrow RecordBatches; pages over the budget are sliced
+        for batch in results.to_arrow_iterable():
+            if batch.nbytes <= max_batch_bytes or batch.num_rows <= 1:
+                yield batch
+                continue
+            rows_per_slice = max(1, batch.num_rows * max_batch_bytes // batch.nbytes)
+            for offset in range(0, batch.num_rows, rows_per_slice):
+                yield batch.slice(offset, rows_per_slice)
+
+    def iter_row_batches(self, results, max_batch_bytes=DEFAULT_MAX_BATCH_BYTES, batch_rows=DEFAULT_PAGE_SIZE):
+        # Yields lists of row dicts; only one batch is alive at a time
+        if hasattr(results, 'to_arrow_iterable'):
+            for batch in self.iter_record_batches(results, max_batch_bytes):
+                yield batch.to_pylist()
+            return
+        rows = iter(results)
+        while True:
+            batch = list(islice(rows, batch_rows))
+            if not batch:
+                return
+            yield batch
+
+    def write_results_csv(self, results, path, compression=None, max_batch_bytes=DEFAULT_MAX_BATCH_BYTES):
+        # compression='gzip' writes a .csv.gz; returns the number of rows written
+        return self._write_batches_csv(self.iter_record_batches(results, max_batch_bytes), path, compression)
+
+    def write_results_parquet(self, results, path, max_batch_bytes=DEFAULT_MAX_BATCH_BYTES):
+        return self._write_batches_parquet(self.iter_record_batches(results, max_batch_bytes), path)
+
+    def _write_batches_csv(self, batches, path, compression=None):
+        import pyarrow as pa
+        import pyarrow.csv as pa_csv
+
+        row_count = 0
+        with pa.output_stream(path, compression=compression) as sink:
+            writer = None
+            for batch in batches:
+                if writer is None:
+                    writer = pa_csv.CSVWriter(sink, batch.schema)
+                writer.write_batch(batch)
+                row_count += batch.num_rows
+            if writer is not None:
+                writer.close()
+        logging.info(f'Wrote {row_count} rows to {path}')
+        return row_count
+
+    def _write_batches_parquet(self, batches, path):
+        # Each batch becomes its own row group, so memory stays at one batch
+        import pyarrow.parquet as pq
+
+        row_count = 0
+        writer = None
+        try:
+            for batch in batches:
+                if writer is None:
+                    writer = pq.ParquetWriter(path, batch.schema, compression='snappy')
+                writer.write_batch(batch)
+                row_count += batch.num_rows
+        finally:
+            if writer is not None:
+                writer.close()
+        logging.info(f'Wrote {row_count} rows to {path}')
+        return row_count
+
+    def write_attachment_section(self, results, title, output_dir, attachment_policy=ATTACHMENT_POLICY,
+                                 max_batch_bytes=DEFAULT_MAX_BATCH_BYTES):
+        # Streams the full result into one attachment file while keeping the first rows for the body.
+        # Returns (summary html, attachment path).
+        import pyarrow as pa
+
+        file_format = attachment_policy.get("file_format", "csv.gz")
+        summary_rows = attachment_policy.get("summary_rows", 20)
+        file_name = re.sub(r'[^A-Za-z0-9_-]+', '_', title).strip('_') or 'results'
+        path = os.path.join(output_dir, f'{file_name}.{file_format}')
+
+        head = []
+        def batches_with_head():
+            head_rows = 0
+            for batch in self.iter_record_batches(results, max_batch_bytes):
+                if head_rows < summary_rows:
+                    head.append(batch.slice(0, summary_rows - head_rows))
+                    head_rows += head[-1].num_rows
+                yield batch
+
+        if file_format == 'parquet':
+            row_count = self._write_batches_parquet(batches_with_head(), path)
+        else:
+            row_count = self._write_batches_csv(batches_with_head(), path, compression='gzip')
+
+        summary = ArrowQueryResults(pa.Table.from_batches(head)) if head else results
+        note = (f'Showing first {min(summary_rows, row_count)} of {row_count} rows. '
+                f'Full result attached as {os.path.basename(path)}.')
+        return ''.join(self.iter_html_table(summary, title, note=note)), path
+
+    def render_results(self, results, title, max_rows=None, attachment_policy=None, output_dir=None,
+                       max_batch_bytes=DEFAULT_MAX_BATCH_BYTES):
+        # Returns (html, attachment path or None); large results go to an attachment when a policy is set
+        total_rows = getattr(results, 'total_rows', None)
+        if (attachment_policy is not None and output_dir is not None and total_rows is not None
+                and total_rows > attachment_policy["row_threshold"] and hasattr(results, 'to_arrow_iterable')):
+            logging.info(f'{title}: {total_rows} rows, sending as attachment')
+            return self.write_attachment_section(results, title, output_dir, attachment_policy, max_batch_bytes)
+        return self.format_results_to_html_table(results, title, max_rows=max_rows,
+                                                 max_batch_bytes=max_batch_bytes), None
+
+    def iter_html_table(self, results, title, max_rows=None, chunk_rows=1000, note=None,
+                        max_batch_bytes=DEFAULT_MAX_BATCH_BYTES):
+        # Yields the table in chunks of joined rows; cells use the bq-table CSS class instead of inline styles
         logging.info(f'Formatting results for table: {title}')
-        html = f'<h2 style="color: #007ACC; font-size: 16px;">{title}</h2>'
-        html += '<table style="border-collapse: collapse; width: auto; margin-bottom: 20px; border: 1px solid #ccc; font-size: 12px;">'
-        html += '<tr style="background-color: #007ACC; color: white;">'
-
-        # Table headers
-        for field in results.schema:
-            html += f'<th style="border: 1px solid #ccc; padding: 2px 4px; text-align: left;">{field.name}</th>'
-        html += '</tr>'
-
-        # Table rows
-        for row in results:
-            html += '<tr>'
-            for field in results.schema:
-                html += f'<td style="border: 1px solid #ccc; padding: 2px 4px; color: #555; line-height: 1.2;">{row[field.name]}</td>'
-            html += '</tr>'
-        
-        html += '</table><br>'
-        logging.info(f'Table {title} formatted successfully')
-        return html
-
-def send_bq_results_email():
-    # Replace these with your actual OAuth2 details
-    oauth2_url = "https://dummy-oauth2-server.example.com/token"
-    client_id = "dummy-client-id"
-    client_secret = "dummy-client-secret"
-    scope = "Public NonPII"
-
-    email_util = EmailUtility(oauth2_url, client_id, client_secret, scope)
-
-    # Example: Sending an email with BigQuery results and DAG run stats
-    dag_run_data = {
-        "load_type": "Incremental",
-        "run_date": "2024-08-08",
-        "start_time": "2024-08-08, 22:00:11 EST",
-        "end_time": "2024-08-08, 22:10:04 EST",
-        "total_duration": "09 Min 53 sec",
-    }
-
-    queries = {
-        "Input Source File Stats": "SELECT * FROM `dummy_project.dummy_dataset.dummy_table1`",
-        "GCP Messages (logs)": "SELECT * FROM `dummy_project.dummy_dataset.dummy_table2`",
-    }
-
-    bigquery_util = BigQueryUtility()
-    html_content = """
+        field_names = [field.name for field in results.schema]
+        yield (
+            f'<h2 class="bq-title">{escape(str(title))}</h2>'
+            '<table class="bq-table"><tr>'
+            + ''.join(f'<th>{escape(name)}</th>' for name in field_names)
+            + '</tr>'
+        )
+
+        # Each row is rendered once from a precomputed template
+        row_template = '<tr>' + '<td>{}</td>' * len(field_names) + '</tr>'
+        rows = chain.from_iterable(self.iter_row_batches(results, max_batch_bytes))
+        if max_rows is not None:
+            rows = islice(rows, max_rows)
+        chunk = []
+        row_count = 0
+        for row in rows:
+            chunk.append(row_template.format(*[escape(str(row[name])) for name in field_names]))
+            row_count += 1
+            if len(chunk) >= chunk_rows:
+                yield ''.join(chunk)
+                chunk = []
+        if chunk:
+            yield ''.join(chunk)
+        yield '</table>'
+
+        total_rows = getattr(results, 'total_rows', None)
+        if note is not None:
+            yield f'<p class="bq-note">{escape(note)}</p>'
+        elif max_rows is not None and total_rows is not None and total_rows > row_count:
+            yield f'<p class="bq-note">Showing first {row_count} of {total_rows} rows.</p>'
+        yield '<br>'
+        logging.info(f'Table {title} formatted successfully ({row_count} rows)')
+
+    def format_results_to_html_table(self, results, title, max_rows=None, max_batch_bytes=DEFAULT_MAX_BATCH_BYTES):
+        return ''.join(self.iter_html_table(results, title, max_rows=max_rows, max_batch_bytes=max_batch_bytes))
+
+    def render_query_section(self, title, sql, max_rows=None, attachment_policy=None, output_dir=None,
+                             page_size=DEFAULT_PAGE_SIZE, max_batch_bytes=DEFAULT_MAX_BATCH_BYTES):
+        # A failing query only replaces its own section with an error paragraph; returns (html, attachment path)
+        try:
+            results = self.execute_query(sql, page_size=page_size)
+            return self.render_results(results, title, max_rows, attachment_policy, output_dir, max_batch_bytes)
+        except Exception as e:
+            logging.error(f'Error executing query for {title}: {e}')
+            return f'<p>Error executing query for {title}: {e}</p>', None
+
+    def render_query_sections(self, queries, max_workers=8, max_rows=None, attachment_policy=None, output_dir=None,
+                              page_size=DEFAULT_PAGE_SIZE, max_batch_bytes=DEFAULT_MAX_BATCH_BYTES):
+        # Submit all queries at once on a bounded thread pool; sections come back in dict order
+        section_args = [(title, sql, max_rows, attachment_policy, output_dir, page_size, max_batch_bytes)
+                        for title, sql in queries.items()]
+        if max_workers <= 1 or len(queries) <= 1:
+            return [self.render_query_section(*args) for args in section_args]
+
+        logging.info(f'Executing {len(queries)} queries with up to {max_workers} workers')
+        with ThreadPoolExecutor(max_workers=min(max_workers, len(queries))) as executor:
+            futures = [executor.submit(self.render_query_section, *args) for args in section_args]
+            return [future.result() for future in futures]
+
+# Replace these with your actual OAuth2 details
+OAUTH2_CONFIG = {
+    "oauth2_url": "https://dummy-oauth2-server.example.com/token",
+    "client_id": "dummy-client-id",
+    "client_secret": "dummy-client-secret",
+    "scope": "Public NonPII",
+}
+
+# Example: Sending an email with BigQuery results and DAG run stats
+DAG_RUN_DATA = {
+    "load_type": "Incremental",
+    "run_date": "2024-08-08",
+    "start_time": "2024-08-08, 22:00:11 EST",
+    "end_time": "2024-08-08, 22:10:04 EST",
+    "total_duration": "09 Min 53 sec",
+}
+
+# One entry per email section: only the listed columns are selected and at most max_rows are returned,
+# so BigQuery scans and returns just what the HTML shows. columns=None falls back to SELECT *.
+# attach_full_result=True drops the LIMIT so the whole result is fetched: results over
+# ATTACHMENT_POLICY["row_threshold"] go out as an attachment, smaller ones are shown in full.
+REPORT_SPEC = [
+    {
+        "title": "Input Source File Stats",
+        "table": "dummy_project.dummy_dataset.dummy_table1",
+        "columns": ["file_name", "record_count", "load_status", "load_timestamp"],
+        "max_rows": 100,
+        "order_by": "load_timestamp DESC",
+    },
+    {
+        "title": "GCP Messages (logs)",
+        "table": "dummy_project.dummy_dataset.dummy_table2",
+        "columns": ["log_timestamp", "severity", "message"],
+        "attach_full_result": True,
+        "order_by": "log_timestamp DESC",
+    },
+]
+
+def compile_section_sql(section):
+    columns = section.get("columns")
+    select_list = ', '.join(f'`{column}`' for column in columns) if columns else '*'
+    sql = f"SELECT {select_list} FROM `{section['table']}`"
+    if section.get("order_by"):
+        sql += f" ORDER BY {section['order_by']}"
+    if section.get("max_rows") is not None and not section.get("attach_full_result"):
+        sql += f" LIMIT {int(section['max_rows'])}"
+    return sql
+
+def compile_report_spec(report_spec):
+    # Returns the title -> SQL dict consumed by render_query_sections, in spec order
+    return {section["title"]: compile_section_sql(section) for section in report_spec}
+
+REPORT_QUERIES = compile_report_spec(REPORT_SPEC)
+
+EMAIL_RECIPIENTS = {
+    "subject": "SBE GCP Data Load Stats - 08/08",
+    "to_email": "recipient@example.com",
+    "cc_email": "cc_recipient@example.com",
+}
+
+EMAIL_FOOTER = """
+        <p>Please don't reply to this email. It is generated by GCP Composer DAG.</p>
+    </body>
+    </html>
+    """
+
+def build_email_header(dag_run_data):
+    return """
     <html>
+    <head>{table_css}</head>
     <body style="font-family: Arial, sans-serif; color: #333;">
         <p>Hi Team,</p>
         <p>Please find the below details of data load.</p>
@@ -85,6 +336,7 @@ def send_bq_results_email():
             </tr>
         </table><br>
     """.format(
+        table_css=TABLE_CSS,
         load_type=dag_run_data["load_type"],
         run_date=dag_run_data["run_date"],
         start_time=dag_run_data["start_time"],
@@ -92,27 +344,121 @@ def send_bq_results_email():
         total_duration=dag_run_data["total_duration"],
     )
 
-    for title, sql in queries.items():
-        try:
-            results = bigquery_util.execute_query(sql)
-            html_content += bigquery_util.format_results_to_html_table(results, title)
-        except Exception as e:
-            logging.error(f'Error executing query for {title}: {e}')
-            html_content += f'<p>Error executing query for {title}: {e}</p>'
-    
-    html_content += """
-        <p>Please don't reply to this email. It is generated by GCP Composer DAG.</p>
-    </body>
-    </html>
-    """
+def send_bq_results_email(max_workers=8, max_rows=None, query_cache=None, attachment_policy=ATTACHMENT_POLICY,
+                          page_size=DEFAULT_PAGE_SIZE, max_batch_bytes=DEFAULT_MAX_BATCH_BYTES):
+    email_util = EmailUtility(**OAUTH2_CONFIG)
+    bigquery_util = BigQueryUtility(query_cache=query_cache)
+    output_dir = tempfile.mkdtemp(prefix='bq_report_')
+
+    try:
+        # max_workers=1 runs the queries one after another as before
+        sections = bigquery_util.render_query_sections(
+            REPORT_QUERIES, max_workers=max_workers, max_rows=max_rows,
+            attachment_policy=attachment_policy, output_dir=output_dir,
+            page_size=page_size, max_batch_bytes=max_batch_bytes,
+        )
+        html_content = build_email_header(DAG_RUN_DATA)
+        html_content += ''.join(html for html, _ in sections)
+        html_content += EMAIL_FOOTER
+        attachments = [path for _, path in sections if path]
+
+        email_util.send_email_via_api(email_content=html_content, attachments=attachments, **EMAIL_RECIPIENTS)
+    finally:
+        shutil.rmtree(output_dir, ignore_errors=True)
+    if bigquery_util.query_cache is not None:
+        logging.info(f'Query cache stats: {bigquery_util.query_cache.stats()}')
+
+# Async pipeline. Backends are duck-typed so tests can pass in-process fakes:
+#   query backend: async run_query(sql) -> results with .schema and iterable rows
+#   email backend: async get_token() and async send(token, subject, to_email, cc_email, email_content, attachments)
+
+class ThreadedBigQueryBackend:
+    # Runs the blocking google-cloud-bigquery calls on worker threads
+    def __init__(self, bigquery_util, page_size=DEFAULT_PAGE_SIZE):
+        self.bigquery_util = bigquery_util
+        self.page_size = page_size
+
+    async def run_query(self, sql):
+        return await asyncio.to_thread(self.bigquery_util.execute_query, sql, True, self.page_size)
+
+class ThreadedEmailBackend:
+    def __init__(self, email_util):
+        self.email_util = email_util
+
+    async def get_token(self):
+        return await asyncio.to_thread(self.email_util.get_oauth2_token)
+
+    async def send(self, token, subject, to_email, cc_email, email_content, attachments=None):
+        # send_email_via_api picks up the token cached by get_token
+        return await asyncio.to_thread(
+            self.email_util.send_email_via_api, subject, to_email, cc_email, email_content, attachments,
+        )
+
+async def send_bq_results_email_async(bigquery_util=None, query_backend=None, email_backend=None, queries=None,
+                                      dag_run_data=None, max_concurrency=8, max_rows=None,
+                                      attachment_policy=ATTACHMENT_POLICY, page_size=DEFAULT_PAGE_SIZE,
+                                      max_batch_bytes=DEFAULT_MAX_BATCH_BYTES):
+    # The token fetch, the queries and the rendering of each finished result all overlap.
+    # Returns the wall-clock seconds spent in each stage.
+    pipeline_start = time.perf_counter()
+    queries = REPORT_QUERIES if queries is None else queries
+    dag_run_data = DAG_RUN_DATA if dag_run_data is None else dag_run_data
+    # Only rendering uses bigquery_util when a query_backend is given, so no BigQuery client is built then
+    bigquery_util = bigquery_util or BigQueryUtility()
+    query_backend = query_backend or ThreadedBigQueryBackend(bigquery_util, page_size)
+    email_backend = email_backend or ThreadedEmailBackend(EmailUtility(**OAUTH2_CONFIG))
+    timings = {'query': {}, 'render': {}}
+
+    async def fetch_token():
+        start = time.perf_counter()
+        token = await email_backend.get_token()
+        timings['token'] = time.perf_counter() - start
+        return token
+
+    semaphore = asyncio.Semaphore(max(1, max_concurrency))
+
+    async def run_section(title, sql):
+        async with semaphore:
+            start = time.perf_counter()
+            try:
+                results = await query_backend.run_query(sql)
+                timings['query'][title] = time.perf_counter() - start
+                start = time.perf_counter()
+                section = await asyncio.to_thread(
+                    bigquery_util.render_results, results, title, max_rows, attachment_policy, output_dir,
+                    max_batch_bytes,
+                )
+                timings['render'][title] = time.perf_counter() - start
+                return section
+            except Exception as e:
+                logging.error(f'Error executing query for {title}: {e}')
+                return f'<p>Error executing query for {title}: {e}</p>', None
+
+    output_dir = tempfile.mkdtemp(prefix='bq_report_')
+    token_task = asyncio.create_task(fetch_token())
+    try:
+        sections_start = time.perf_counter()
+        sections = await asyncio.gather(*(run_section(title, sql) for title, sql in queries.items()))
+        timings['sections'] = time.perf_counter() - sections_start
+
+        html_content = build_email_header(dag_run_data) + ''.join(html for html, _ in sections) + EMAIL_FOOTER
+        attachments = [path for _, path in sections if path]
+        token = await token_task
+
+        start = time.perf_counter()
+        await email_backend.send(token, email_content=html_content, attachments=attachments, **EMAIL_RECIPIENTS)
+        timings['send'] = time.perf_counter() - start
+    finally:
+        shutil.rmtree(output_dir, ignore_errors=True)
+    timings['total'] = time.perf_counter() - pipeline_start
+    if bigquery_util.query_cache is not None:
+        timings['query_cache'] = bigquery_util.query_cache.stats()
 
-    email_util.send_email_via_api(
-        subject="SBE GCP Data Load Stats - 08/08",
-        to_email="recipient@example.com",
-        cc_email="cc_recipient@example.com",
-        email_content=html_content
+    logging.info(
+        f"Async report sent in {timings['total']:.2f}s "
+        f"(token {timings['token']:.2f}s, queries+render {timings['sections']:.2f}s, send {timings['send']:.2f}s)"
     )
+    return timings
 
 if __name__ == "__main__":
     send_bq_results_email()
-  
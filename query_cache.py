@@ -0,0 +1,224 @@
+import hashlib
+import logging
+import os
+import re
+import threading
+import time
+from collections import OrderedDict, namedtuple
+
+# Configure logging
+logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
+
+CachedField = namedtuple('CachedField', ['name'])
+
+def _remove_file(path):
+    # Another worker may have removed the same file already
+    try:
+        os.remove(path)
+    except FileNotFoundError:
+        pass
+
+# String literals, quoted identifiers and comments, which normalize_sql keeps verbatim.
+# Line comments take their newline with them so the next line doesn't end up inside the comment.
+_SQL_VERBATIM = re.compile(
+    r"('''.*?'''|\"\"\".*?\"\"\"|'(?:\\.|[^'\\])*'|\"(?:\\.|[^\"\\])*\"|`[^`]*`"
+    r"|--[^\n]*\n?|#[^\n]*\n?|/\*.*?\*/)",
+    re.DOTALL,
+)
+
+def normalize_sql(sql):
+    # Whitespace between tokens and a trailing semicolon don't change the query; anything inside
+    # literals, quoted identifiers or comments may, and so does case
+    parts = _SQL_VERBATIM.split(sql)
+    for i in range(0, len(parts), 2):
+        parts[i] = re.sub(r'\s+', ' ', parts[i])
+    return ''.join(parts).strip().rstrip(';').strip()
+
+class ArrowQueryResults:
+    # Wraps a pyarrow Table so it renders like a BigQuery RowIterator (.schema, .total_rows, row[name])
+    def __init__(self, table):
+        self.table = table
+        self.schema = [CachedField(name) for name in table.schema.names]
+        self.total_rows = table.num_rows
+
+    def __iter__(self):
+        for batch in self.table.to_batches():
+            yield from batch.to_pylist()
+
+    def to_arrow_iterable(self):
+        return iter(self.table.to_batches())
+
+class CachingQueryResults:
+    # Streams a BigQuery RowIterator's Arrow pages to the caller and caches them once fully read.
+    # If the pages outgrow max_bytes, caching is abandoned and the pages seen so far are released,
+    # so memory stays bounded by the streaming batch rather than the result size.
+    def __init__(self, results, cache, sql, max_bytes):
+        self.results = results
+        self.cache = cache
+        self.sql = sql
+        self.max_bytes = max_bytes
+        self.schema = results.schema
+        self.total_rows = results.total_rows
+
+    def __iter__(self):
+        for batch in self.to_arrow_iterable():
+            yield from batch.to_pylist()
+
+    def to_arrow_iterable(self):
+        batches = []
+        cached_bytes = 0
+        caching = True
+        for batch in self.results.to_arrow_iterable():
+            if caching:
+                cached_bytes += batch.nbytes
+                if cached_bytes > self.max_bytes:
+                    logging.info(f'Result larger than {self.max_bytes} bytes, not caching: {normalize_sql(self.sql)[:80]}')
+                    caching = False
+                    batches = []
+                else:
+                    batches.append(batch)
+            yield batch
+        if caching and batches:
+            import pyarrow as pa
+            self.cache.put(self.sql, pa.Table.from_batches(batches))
+
+class QueryResultCache:
+    def __init__(self, ttl_seconds=900, max_entries=32, max_bytes=256 * 1024 * 1024,
+                 cache_dir=None, max_disk_bytes=2 * 1024 * 1024 * 1024):
+        # In-memory LRU of pyarrow Tables, optionally backed by Arrow IPC files in cache_dir
+        self.ttl_seconds = ttl_seconds
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self.cache_dir = cache_dir
+        self.max_disk_bytes = max_disk_bytes
+        self._entries = OrderedDict()  # key -> (stored_at, table)
+        self._bytes = 0
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.disk_hits = 0
+        self.misses = 0
+        if cache_dir:
+            os.makedirs(cache_dir, exist_ok=True)
+
+    def _key(self, sql):
+        return hashlib.sha256(normalize_sql(sql).encode('utf-8')).hexdigest()
+
+    def _path(self, key):
+        return os.path.join(self.cache_dir, f'{key}.arrow')
+
+    def get(self, sql):
+        key = self._key(sql)
+        now = time.time()
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None:
+                stored_at, table = entry
+                if now - stored_at <= self.ttl_seconds:
+                    self._entries.move_to_end(key)
+                    self.hits += 1
+                    logging.info(f'Query cache hit (memory): {key[:12]}')
+                    return table
+                self._drop(key)
+
+        disk_entry = self._read_disk(key, now)
+        with self._lock:
+            if disk_entry is None:
+                self.misses += 1
+                logging.info(f'Query cache miss: {key[:12]}')
+                return None
+            stored_at, table = disk_entry
+            self.hits += 1
+            self.disk_hits += 1
+            self._store(key, stored_at, table)
+        logging.info(f'Query cache hit (disk): {key[:12]}')
+        return table
+
+    def put(self, sql, table):
+        key = self._key(sql)
+        with self._lock:
+            self._store(key, time.time(), table)
+        self._write_disk(key, table)
+
+    def stats(self):
+        with self._lock:
+            return {
+                'hits': self.hits,
+                'disk_hits': self.disk_hits,
+                'misses': self.misses,
+                'entries': len(self._entries),
+                'bytes': self._bytes,
+            }
+
+    def _store(self, key, stored_at, table):
+        if key in self._entries:
+            self._drop(key)
+        if table.nbytes > self.max_bytes:
+            return
+        self._entries[key] = (stored_at, table)
+        self._bytes += table.nbytes
+        # Evict least recently used entries until both limits hold
+        while len(self._entries) > self.max_entries or self._bytes > self.max_bytes:
+            self._drop(next(iter(self._entries)))
+
+    def _drop(self, key):
+        _, table = self._entries.pop(key)
+        self._bytes -= table.nbytes
+
+    def _read_disk(self, key, now):
+        if not self.cache_dir:
+            return None
+        path = self._path(key)
+        try:
+            stored_at = os.path.getmtime(path)
+            if now - stored_at > self.ttl_seconds:
+                _remove_file(path)
+                return None
+            import pyarrow as pa
+            with pa.memory_map(path) as source:
+                return stored_at, pa.ipc.open_file(source).read_all()
+        except FileNotFoundError:
+            return None
+        except Exception as e:
+            logging.warning(f'Ignoring unreadable query cache file {path}: {e}')
+            return None
+
+    def _write_disk(self, key, table):
+        if not self.cache_dir:
+            return
+        import pyarrow as pa
+        path = self._path(key)
+        tmp_path = f'{path}.{threading.get_ident()}.tmp'
+        try:
+            with pa.OSFile(tmp_path, 'wb') as sink:
+                with pa.ipc.new_file(sink, table.schema) as writer:
+                    writer.write_table(table)
+            os.replace(tmp_path, path)
+        except Exception as e:
+            logging.warning(f'Failed to write query cache file {path}: {e}')
+            _remove_file(tmp_path)
+            return
+        self._prune_disk()
+
+    def _prune_disk(self):
+        # Remove expired files, then the oldest ones until the directory fits max_disk_bytes
+        now = time.time()
+        files = []
+        for name in os.listdir(self.cache_dir):
+            if not name.endswith('.arrow'):
+                continue
+            path = os.path.join(self.cache_dir, name)
+            try:
+                stat = os.stat(path)
+            except FileNotFoundError:
+                continue
+            if now - stat.st_mtime > self.ttl_seconds:
+                _remove_file(path)
+            else:
+                files.append((stat.st_mtime, stat.st_size, path))
+
+        total = sum(size for _, size, _ in files)
+        for _, size, path in sorted(files):
+            if total <= self.max_disk_bytes:
+                break
+            _remove_file(path)
+            total -= size
@@ -0,0 +1,194 @@
+import numpy as np
+
+
+class QuantileSketch:
+    """Mergeable KLL-style quantile sketch for one numeric column
+
+    Values are kept in levels; a level holding more than k values is sorted and every
+    other value is promoted to the next level with twice the weight. Memory stays at
+    about k values per level, and sketches built on different chunks or workers can be
+    combined with merge().
+    """
+
+    def __init__(self, k=2048, seed=None):
+        self.k = k
+        self.levels = [np.empty(0)]
+        self.count = 0
+        self.min = np.inf
+        self.max = -np.inf
+        self._rng = np.random.default_rng(seed)
+
+    def update(self, values):
+        values = np.asarray(values, dtype=float).ravel()
+        values = values[~np.isnan(values)]
+        if values.size == 0:
+            return self
+        self.count += values.size
+        self.min = min(self.min, values.min())
+        self.max = max(self.max, values.max())
+        self.levels[0] = np.concatenate([self.levels[0], values])
+        self._compress()
+        return self
+
+    def merge(self, other):
+        for level, values in enumerate(other.levels):
+            if level == len(self.levels):
+                self.levels.append(np.empty(0))
+            self.levels[level] = np.concatenate([self.levels[level], values])
+        self.count += other.count
+        self.min = min(self.min, other.min)
+        self.max = max(self.max, other.max)
+        self._compress()
+        return self
+
+    def _compress(self):
+        level = 0
+        while level < len(self.levels):
+            values = self.levels[level]
+            if values.size > self.k:
+                values = np.sort(values)
+                # An odd leftover stays at this level so the total weight is preserved
+                keep = values[-1:] if values.size % 2 else values[:0]
+                paired = values[:values.size - keep.size]
+                promoted = paired[self._rng.integers(2)::2]
+                self.levels[level] = keep
+                if level + 1 == len(self.levels):
+                    self.levels.append(np.empty(0))
+                self.levels[level + 1] = np.concatenate([self.levels[level + 1], promoted])
+            level += 1
+
+    def weighted_values(self):
+        """Sorted retained values and the number of inputs each one stands for"""
+        values = np.concatenate(self.levels)
+        weights = np.concatenate([np.full(v.size, 2.0 ** level) for level, v in enumerate(self.levels)])
+        order = np.argsort(values, kind='stable')
+        return values[order], weights[order]
+
+    def quantile(self, q):
+        """Approximate quantiles; exact (linear interpolation, like pandas) until the first compaction"""
+        q = np.asarray(q, dtype=float)
+        if self.count == 0:
+            return np.full(q.shape, np.nan)
+        values, weights = self.weighted_values()
+        cumulative = np.cumsum(weights)
+        total = cumulative[-1]
+        if total <= 1:
+            return np.full(q.shape, values[0])
+        positions = np.clip((cumulative - weights / 2 - 0.5) / (total - 1), 0, 1)
+        xp = np.concatenate([[0.0], positions, [1.0]])
+        fp = np.concatenate([[self.min], values, [self.max]])
+        return np.interp(q, xp, fp)
+
+
+class RunningMoments:
+    """Per-column count, mean, variance, min, max and max-abs, updated chunk by chunk
+
+    Chunks are folded in with the Chan et al. pairwise form of Welford's update, which is
+    also how two partial results from different files or workers are merged. NaNs are skipped.
+    """
+
+    def __init__(self, n_columns):
+        self.count = np.zeros(n_columns)
+        self.mean = np.zeros(n_columns)
+        self.m2 = np.zeros(n_columns)
+        self.min = np.full(n_columns, np.inf)
+        self.max = np.full(n_columns, -np.inf)
+
+    def update(self, values):
+        values = np.asarray(values, dtype=float)
+        if values.ndim == 1:
+            values = values[:, None]
+        if values.shape[0] == 0:
+            return self
+        chunk = RunningMoments(values.shape[1])
+        valid = ~np.isnan(values)
+        chunk.count = valid.sum(axis=0).astype(float)
+        has_values = chunk.count > 0
+        with np.errstate(invalid='ignore', divide='ignore'):
+            chunk.mean = np.where(has_values, np.nansum(values, axis=0) / chunk.count, 0.0)
+        chunk.m2 = np.nansum((values - chunk.mean) ** 2 * valid, axis=0)
+        chunk.min = np.where(valid, values, np.inf).min(axis=0)
+        chunk.max = np.where(valid, values, -np.inf).max(axis=0)
+        return self.merge(chunk)
+
+    def merge(self, other):
+        total = self.count + other.count
+        delta = other.mean - self.mean
+        with np.errstate(invalid='ignore', divide='ignore'):
+            weight = np.where(total > 0, other.count / total, 0.0)
+            self.m2 = self.m2 + other.m2 + np.where(total > 0, delta ** 2 * self.count * other.count / total, 0.0)
+        self.mean = self.mean + delta * weight
+        self.count = total
+        self.min = np.minimum(self.min, other.min)
+        self.max = np.maximum(self.max, other.max)
+        return self
+
+    @property
+    def var(self):
+        """Population variance (ddof=0), as StandardScaler uses"""
+        with np.errstate(invalid='ignore', divide='ignore'):
+            return np.where(self.count > 0, self.m2 / self.count, np.nan)
+
+    @property
+    def std(self):
+        return np.sqrt(self.var)
+
+    @property
+    def max_abs(self):
+        return np.maximum(np.abs(self.min), np.abs(self.max))
+
+
+class HyperLogLog:
+    """Approximate distinct count in 2**p one-byte registers (relative error about 1.04 / sqrt(2**p))
+
+    update() hashes values with pandas.util.hash_array, so strings, numbers and mixed object
+    columns are all supported; update_hashes() takes precomputed uint64 hashes. Sketches built on
+    different chunks or workers are combined with merge().
+    """
+
+    def __init__(self, p=14):
+        if not 4 <= p <= 18:
+            raise ValueError(f"p must be between 4 and 18, got {p}")
+        self.p = p
+        self.registers = np.zeros(1 << p, dtype=np.uint8)
+
+    def update(self, values):
+        import pandas as pd
+        values = np.asarray(values).ravel()
+        if values.dtype.kind in 'iuf':
+            # One chunk of a column may load as int and the next as float (NaNs); hash both alike
+            values = values.astype(float)
+            values = values[~np.isnan(values)]
+        elif values.dtype == object:
+            values = values[~pd.isna(values)]
+        if values.size:
+            self.update_hashes(pd.util.hash_array(values))
+        return self
+
+    def update_hashes(self, hashes):
+        hashes = np.asarray(hashes, dtype=np.uint64)
+        index = (hashes >> np.uint64(64 - self.p)).astype(np.intp)
+        remaining = hashes << np.uint64(self.p)
+        # Bit length via frexp on each 32-bit half, both exactly representable as float64
+        high = np.frexp((remaining >> np.uint64(32)).astype(float))[1]
+        low = np.frexp((remaining & np.uint64(0xFFFFFFFF)).astype(float))[1]
+        bit_length = np.where(high > 0, high + 32, low)
+        rank = np.minimum(64 - bit_length + 1, 64 - self.p + 1).astype(np.uint8)
+        np.maximum.at(self.registers, index, rank)
+        return self
+
+    def merge(self, other):
+        if other.p != self.p:
+            raise ValueError(f"Cannot merge HyperLogLog sketches with p={self.p} and p={other.p}")
+        np.maximum(self.registers, other.registers, out=self.registers)
+        return self
+
+    def count(self):
+        m = self.registers.size
+        alpha = 0.7213 / (1 + 1.079 / m)
+        estimate = alpha * m * m / np.sum(np.ldexp(1.0, -self.registers.astype(int)))
+        zeros = np.count_nonzero(self.registers == 0)
+        if estimate <= 2.5 * m and zeros:
+            # Linear counting is more accurate while many registers are still empty
+            estimate = m * np.log(m / zeros)
+        return int(round(estimate))